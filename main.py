@@ -1,25 +1,93 @@
 import os
 import re
 import asyncio
+import hashlib
+import heapq
+import ipaddress
+import itertools
 import secrets
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from urllib.parse import urlsplit
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Query
+from fastapi import FastAPI, HTTPException, UploadFile, File, Query, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
-import requests
+from pymongo import DeleteOne
+from pymongo.errors import DuplicateKeyError
+import aiofiles
+import aiofiles.os
+import httpx
 
 from database import db
 
+# Bound once instead of looked up per request. Times stay naive UTC, matching
+# what Mongo hands back, so comparisons never mix aware and naive datetimes.
+_PAGES = db["page"] if db is not None else None
+_utcnow = datetime.utcnow
+
 # Constants
 DEFAULT_TTL_SECONDS = 600  # 10 minutes
+CLEANUP_BATCH_SIZE = 500
+CLEANUP_RETRY_SECONDS = 5
+# The expiry queue only holds pages due within this window and is refilled from Mongo
+# every EXPIRY_REFILL_SECONDS, so its size and each scan are bounded by traffic, not
+# by the collection size
+EXPIRY_HORIZON_SECONDS = 600
+EXPIRY_REFILL_SECONDS = EXPIRY_HORIZON_SECONDS // 2
+# Mongo's TTL monitor reaps expired pages only after this grace period, so the
+# in-process expiry queue always gets to unlink their assets first
+EXPIRED_GRACE_SECONDS = 300
+PAGE_CACHE_SIZE = 4096
+# Byte budget for cached page bodies (per worker); larger pages are rendered on every request
+PAGE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+PAGE_CACHE_MAX_ENTRY_BYTES = 256 * 1024
+COLLECTIONS_CACHE_SECONDS = 30
+SLUG_INSERT_ATTEMPTS = 3
+_SLUG_STRIP = str.maketrans("", "", "-_")
 UPLOAD_DIR = os.path.join(os.getcwd(), "uploads")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
-
-app = FastAPI()
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+STATIC_CACHE_CONTROL = "public, max-age=86400"
+UPLOADS_CACHE_CONTROL = "public, max-age=600, immutable"
+MAX_IMAGE_BYTES = 8 * 1024 * 1024  # 8MB limit
+UPLOAD_CHUNK_SIZE = 64 * 1024
+_URL_RE = re.compile(r"^https?://", re.IGNORECASE)
+# content type -> file extension for stored images
+_IMAGE_EXT = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+    "image/svg+xml": ".svg",
+}.get
+
+# /p/{slug} document, pre-split so rendering is a join: prefix + page html + timer head + remaining + timer tail.
+# The timer widget itself lives in static/timer.js so browsers cache it across pages.
+_HTML_PREFIX = b"""<!doctype html>
+<html>
+  <head>
+    <meta charset="utf-8" />
+    <meta name="viewport" content="width=device-width, initial-scale=1" />
+    <title>Shared Content</title>
+    <style>html,body{background:#fff;margin:0;padding:0}img{max-width:100%;height:auto}</style>
+  </head>
+  <body>
+"""
+# Content hash in the URL so a changed widget is fetched fresh despite the long max-age
+with open(os.path.join(STATIC_DIR, "timer.js"), "rb") as _f:
+    _TIMER_JS_VERSION = hashlib.sha256(_f.read()).hexdigest()[:12]
+_TIMER_HEAD = b'\n    <script src="/static/timer.js?v=%s" data-remaining="' % _TIMER_JS_VERSION.encode()
+_TIMER_TAIL = b'''" defer></script>
+  </body>
+</html>
+'''
+
+app = FastAPI(default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -29,8 +97,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Serve uploaded files
-app.mount("/uploads", StaticFiles(directory=UPLOAD_DIR), name="uploads")
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that sends a fixed Cache-Control header with every file."""
+
+    def __init__(self, *args, cache_control: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_control = cache_control
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = self.cache_control
+        return response
+
+
+# Serve uploaded files; names are random and never rewritten, so clients may cache them as immutable
+app.mount(
+    "/uploads",
+    CachedStaticFiles(directory=UPLOAD_DIR, html=False, check_dir=False, cache_control=UPLOADS_CACHE_CONTROL),
+    name="uploads",
+)
+# Shared page assets (timer widget)
+app.mount("/static", CachedStaticFiles(directory=STATIC_DIR, cache_control=STATIC_CACHE_CONTROL), name="static")
 
 
 class PageCreate(BaseModel):
@@ -46,39 +134,202 @@ def to_iso_utc(dt: datetime) -> str:
     return dt.isoformat()
 
 
+def to_epoch_utc(dt: datetime) -> int:
+    """Return Unix seconds for dt (assume UTC if naive)."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def page_expiry(doc: dict) -> Tuple[int, str]:
+    """Return (expires_epoch, expires_iso) precomputed on the page at insert."""
+    if "expires_epoch" not in doc:
+        # pages stored before these fields existed
+        return to_epoch_utc(doc["expires_at"]), to_iso_utc(doc["expires_at"])
+    return doc["expires_epoch"], doc["expires_iso"]
+
+
+async def unlink_assets(assets: Optional[List[str]]) -> None:
+    """Delete uploaded asset files; only files directly inside UPLOAD_DIR are touched."""
+    for asset in assets or ():
+        # asset paths are like /uploads/filename.ext or uploads/filename.ext
+        name = os.path.basename(asset.lstrip("/"))
+        if not name:
+            continue
+        try:
+            # off the event loop; uploads may sit on slow or network storage
+            await aiofiles.os.remove(os.path.join(UPLOAD_DIR, name))
+        except OSError:
+            # already gone (FileNotFoundError) or not removable; best-effort
+            pass
+
+
+# Rendered /p/{slug} pages up to the timer value, LRU-ordered: slug -> (expires_epoch, body)
+_page_cache: "OrderedDict[str, Tuple[int, bytes]]" = OrderedDict()
+_page_cache_bytes = 0
+
+
+def get_cached_page(slug: str, now: int) -> Optional[Tuple[int, bytes]]:
+    """Return the cached render for slug, evicting it once expired."""
+    entry = _page_cache.get(slug)
+    if entry is None:
+        return None
+    if entry[0] <= now:
+        evict_cached_page(slug)
+        return None
+    _page_cache.move_to_end(slug)
+    return entry
+
+
+def render_page(body: bytes, remaining: int) -> bytes:
+    return b"".join((body, _TIMER_HEAD, str(remaining).encode(), _TIMER_TAIL))
+
+
+def evict_cached_page(slug: str) -> None:
+    global _page_cache_bytes
+    entry = _page_cache.pop(slug, None)
+    if entry is not None:
+        _page_cache_bytes -= len(entry[1])
+
+
+def cache_page(slug: str, expires_epoch: int, body: bytes) -> None:
+    global _page_cache_bytes
+    if len(body) > PAGE_CACHE_MAX_ENTRY_BYTES:
+        return
+    evict_cached_page(slug)
+    _page_cache[slug] = (expires_epoch, body)
+    _page_cache_bytes += len(body)
+    while len(_page_cache) > PAGE_CACHE_SIZE or _page_cache_bytes > PAGE_CACHE_MAX_BYTES:
+        _, (_, evicted) = _page_cache.popitem(last=False)
+        _page_cache_bytes -= len(evicted)
+
+
+# Live pages ordered by expiry: (expires_at, seq, page _id, assets). seq breaks ties so
+# _ids (str slugs, or ObjectIds on older pages) and asset lists are never compared.
+_expiry_heap: List[Tuple[datetime, int, object, List[str]]] = []
+_expiry_seq = itertools.count()
+# ids currently in _expiry_heap, so refills don't queue a page twice
+_expiry_ids: set = set()
+# Set whenever the head of _expiry_heap changes; created on startup inside the running loop
+_expiry_event: Optional[asyncio.Event] = None
+
+
+def schedule_expiry(expires_at: datetime, slug: str, assets: Optional[List[str]]) -> None:
+    """Queue a page for deletion at expires_at, waking the cleanup task if it is now first."""
+    if not isinstance(expires_at, datetime):
+        # not a date; left to the TTL index / delete-on-access
+        return
+    if expires_at.tzinfo is not None:
+        # the heap compares naive UTC values only
+        expires_at = expires_at.astimezone(timezone.utc).replace(tzinfo=None)
+    if slug in _expiry_ids or expires_at > _utcnow() + timedelta(seconds=EXPIRY_HORIZON_SECONDS):
+        # already queued, or far enough out that a later refill will pick it up
+        return
+    _expiry_ids.add(slug)
+    entry = (expires_at, next(_expiry_seq), slug, assets or [])
+    heapq.heappush(_expiry_heap, entry)
+    if _expiry_event is not None and _expiry_heap[0] is entry:
+        _expiry_event.set()
+
+
+async def refill_expiry_queue() -> None:
+    """Queue pages (created by any worker or before a restart) that expire within the horizon."""
+    horizon = _utcnow() + timedelta(seconds=EXPIRY_HORIZON_SECONDS)
+    cursor = _PAGES.find(
+        {"expires_at": {"$lte": horizon}}, {"expires_at": 1, "assets": 1}
+    ).batch_size(CLEANUP_BATCH_SIZE)
+    async for doc in cursor:
+        schedule_expiry(doc["expires_at"], doc["_id"], doc.get("assets"))
+
+
+async def find_page(slug: str) -> Optional[dict]:
+    doc = await _PAGES.find_one({"_id": slug})
+    if doc is None:
+        # pages created before the slug became the _id; drop once they've aged out (<= 24h)
+        doc = await _PAGES.find_one({"slug": slug})
+    return doc
+
+
+async def expire_page(doc: dict) -> None:
+    """Delete an expired page and its assets."""
+    evict_cached_page(doc.get("slug", doc["_id"]))
+    try:
+        await _PAGES.delete_one({"_id": doc["_id"]})
+    except Exception:
+        pass
+    await unlink_assets(doc.get("assets"))
+
+
 @app.on_event("startup")
 async def startup_cleanup_task():
+    global _expiry_event
+    _expiry_event = asyncio.Event()
+    if db is not None:
+        try:
+            # Expired documents are removed server-side by the TTL monitor
+            await _PAGES.create_index("expires_at", expireAfterSeconds=EXPIRED_GRACE_SECONDS)
+        except Exception:
+            pass
+
     async def cleanup_loop():
+        # Sleeps until the earliest page expires, a sooner one is scheduled, or the next refill
+        next_refill = 0.0
         while True:
             try:
-                # Use naive UTC consistently for Mongo comparisons
-                now = datetime.utcnow()
-                expired = list(db["page"].find({"expires_at": {"$lte": now}}))
-                if expired:
+                if db is not None and time.monotonic() >= next_refill:
+                    await refill_expiry_queue()
+                    next_refill = time.monotonic() + EXPIRY_REFILL_SECONDS
+                _expiry_event.clear()
+                timeout = None
+                if db is not None:
+                    timeout = next_refill - time.monotonic()
+                if _expiry_heap:
+                    # Use naive UTC consistently for Mongo comparisons
+                    due = (_expiry_heap[0][0] - _utcnow()).total_seconds()
+                    timeout = due if timeout is None else min(timeout, due)
+                if timeout is None or timeout > 0:
+                    try:
+                        await asyncio.wait_for(_expiry_event.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                now = _utcnow()
+                batch = []
+                while _expiry_heap and _expiry_heap[0][0] <= now:
+                    _, _, slug, assets = heapq.heappop(_expiry_heap)
+                    _expiry_ids.discard(slug)
+                    evict_cached_page(slug)
                     # delete associated assets
-                    for doc in expired:
-                        for asset in doc.get("assets", []) or []:
-                            # asset paths are like /uploads/filename.ext or uploads/filename.ext
-                            relative = asset.lstrip("/")
-                            path = os.path.join(os.getcwd(), relative)
-                            # If path is outside uploads dir, try within uploads
-                            if not os.path.isfile(path):
-                                path = os.path.join(UPLOAD_DIR, os.path.basename(relative))
-                            try:
-                                if os.path.isfile(path):
-                                    os.remove(path)
-                            except Exception:
-                                pass
-                    # delete docs
-                    db["page"].delete_many({"_id": {"$in": [d["_id"] for d in expired]}})
+                    await unlink_assets(assets)
+                    batch.append(DeleteOne({"_id": slug}))
+                    if len(batch) >= CLEANUP_BATCH_SIZE:
+                        await _PAGES.bulk_write(batch, ordered=False)
+                        batch = []
+                if batch:
+                    await _PAGES.bulk_write(batch, ordered=False)
             except Exception:
-                # Best-effort cleanup; ignore errors
-                pass
-            await asyncio.sleep(60)
+                # Best-effort cleanup; back off so a persistent error can't spin the event loop
+                await asyncio.sleep(CLEANUP_RETRY_SECONDS)
 
     asyncio.create_task(cleanup_loop())
 
 
+@app.on_event("startup")
+async def startup_http_client():
+    # Shared connection pool for outbound fetches; idle keep-alive connections are
+    # reused so repeat fetches from the same host skip the TCP/TLS handshake
+    app.state.http = httpx.AsyncClient(
+        timeout=10,
+        limits=httpx.Limits(max_connections=500, max_keepalive_connections=256, keepalive_expiry=30),
+    )
+
+
+@app.on_event("shutdown")
+async def shutdown_http_client():
+    await app.state.http.aclose()
+
+
 @app.get("/")
 def read_root():
     return {"message": "Temporary Content Sharing API"}
@@ -88,204 +339,199 @@ def read_root():
 async def upload_image(file: UploadFile = File(...)):
     if not file.content_type or not file.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="Only image uploads are allowed")
-    ext = {
-        "image/jpeg": ".jpg",
-        "image/png": ".png",
-        "image/gif": ".gif",
-        "image/webp": ".webp",
-        "image/svg+xml": ".svg",
-    }.get(file.content_type, "")
+    ext = _IMAGE_EXT(file.content_type, "")
     filename = f"{secrets.token_urlsafe(12)}{ext}"
     filepath = os.path.join(UPLOAD_DIR, filename)
-    content = await file.read()
-    with open(filepath, "wb") as f:
-        f.write(content)
+    size = 0
+    try:
+        async with aiofiles.open(filepath, "wb") as f:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > MAX_IMAGE_BYTES:
+                    raise HTTPException(status_code=413, detail="Image too large")
+                await f.write(chunk)
+    except Exception:
+        try:
+            await aiofiles.os.remove(filepath)
+        except Exception:
+            pass
+        raise
     url_path = f"/uploads/{filename}"
     return {"url": url_path}
 
 
+async def resolves_to_public_host(host: str) -> bool:
+    """True if every address host resolves to is publicly routable.
+
+    Rejects loopback, private, link-local (cloud metadata), reserved and
+    multicast targets so proxy_image can't be pointed at internal services.
+    """
+    infos = await asyncio.get_running_loop().getaddrinfo(host, None)
+    for info in infos:
+        # IPv6 sockaddrs may carry a %scope suffix
+        ip = ipaddress.ip_address(info[4][0].split("%", 1)[0])
+        if not ip.is_global or ip.is_multicast:
+            return False
+    return bool(infos)
+
+
 @app.get("/api/proxy-image")
-def proxy_image(url: str = Query(..., description="Image URL to mirror into uploads")):
-    if not (url.startswith("http://") or url.startswith("https://")):
+async def proxy_image(url: str = Query(..., description="Image URL to mirror into uploads")):
+    if not _URL_RE.match(url):
         raise HTTPException(status_code=400, detail="Invalid URL")
     try:
-        r = requests.get(url, timeout=10, stream=True)
-    except Exception:
+        host = urlsplit(url).hostname
+    except ValueError:
+        host = None
+    if not host:
+        raise HTTPException(status_code=400, detail="Invalid URL")
+    try:
+        public = await resolves_to_public_host(host)
+    except (OSError, UnicodeError):
         raise HTTPException(status_code=400, detail="Could not fetch image")
-    if r.status_code != 200:
-        raise HTTPException(status_code=400, detail="Image not accessible")
-    content_type = r.headers.get("content-type", "")
-    if not content_type.startswith("image/"):
-        raise HTTPException(status_code=400, detail="URL is not an image")
-    ext = {
-        "image/jpeg": ".jpg",
-        "image/png": ".png",
-        "image/gif": ".gif",
-        "image/webp": ".webp",
-        "image/svg+xml": ".svg",
-    }.get(content_type, "")
-    filename = f"{secrets.token_urlsafe(12)}{ext}"
-    filepath = os.path.join(UPLOAD_DIR, filename)
-    size = 0
-    max_bytes = 8 * 1024 * 1024  # 8MB limit
-    with open(filepath, "wb") as f:
-        for chunk in r.iter_content(8192):
-            if not chunk:
-                break
-            size += len(chunk)
-            if size > max_bytes:
+    if not public:
+        raise HTTPException(status_code=400, detail="URL not allowed")
+    try:
+        async with app.state.http.stream("GET", url) as r:
+            if r.status_code != 200:
+                raise HTTPException(status_code=400, detail="Image not accessible")
+            content_type = r.headers.get("content-type", "")
+            if not content_type.startswith("image/"):
+                raise HTTPException(status_code=400, detail="URL is not an image")
+            ext = _IMAGE_EXT(content_type, "")
+            filename = f"{secrets.token_urlsafe(12)}{ext}"
+            filepath = os.path.join(UPLOAD_DIR, filename)
+            size = 0
+            try:
+                async with aiofiles.open(filepath, "wb") as f:
+                    async for chunk in r.aiter_bytes(UPLOAD_CHUNK_SIZE):
+                        size += len(chunk)
+                        if size > MAX_IMAGE_BYTES:
+                            raise HTTPException(status_code=413, detail="Image too large")
+                        await f.write(chunk)
+            except Exception:
                 try:
-                    os.remove(filepath)
+                    await aiofiles.os.remove(filepath)
                 except Exception:
                     pass
-                raise HTTPException(status_code=413, detail="Image too large")
-            f.write(chunk)
+                raise
+    except (httpx.HTTPError, httpx.InvalidURL):
+        raise HTTPException(status_code=400, detail="Could not fetch image")
     return {"url": f"/uploads/{filename}"}
 
 
 def generate_slug(length: int = 8) -> str:
-    # base62-like safe slug
+    # base62-like safe slug; it is the page's _id, so uniqueness is enforced on insert
     while True:
-        slug = secrets.token_urlsafe(length)  # includes -_
-        slug = re.sub(r"[^A-Za-z0-9]", "", slug)[:length]
-        if slug and db["page"].count_documents({"slug": slug}) == 0:
+        slug = secrets.token_urlsafe(length).translate(_SLUG_STRIP)[:length]  # drop -_
+        if len(slug) == length:
             return slug
 
 
 @app.post("/api/pages")
-def create_page(payload: PageCreate):
+async def create_page(payload: PageCreate):
     # Use naive UTC to store in Mongo to avoid tz-aware comparisons
-    now = datetime.utcnow()
+    now = _utcnow()
     ttl = payload.ttl_seconds or DEFAULT_TTL_SECONDS
     expires_at = now + timedelta(seconds=ttl)
-    slug = generate_slug(8)
-
-    doc = {
-        "slug": slug,
-        "html": payload.html,
-        "created_at": now,
-        "expires_at": expires_at,
-        "assets": payload.assets or [],
-    }
-    db["page"].insert_one(doc)
+    # Invariant per page; stored so reads don't redo datetime math
+    expires_epoch = to_epoch_utc(expires_at)
+    expires_iso = to_iso_utc(expires_at)
+
+    for _ in range(SLUG_INSERT_ATTEMPTS):
+        slug = generate_slug(8)
+        doc = {
+            "_id": slug,
+            "slug": slug,
+            "html": payload.html,
+            "created_at": now,
+            "expires_at": expires_at,
+            "expires_epoch": expires_epoch,
+            "expires_iso": expires_iso,
+            "assets": payload.assets or [],
+        }
+        try:
+            await _PAGES.insert_one(doc)
+            break
+        except DuplicateKeyError:
+            continue
+    else:
+        raise HTTPException(status_code=503, detail="Could not allocate a page slug")
+    schedule_expiry(expires_at, slug, doc["assets"])
 
     return {
         "slug": slug,
         "url": f"/p/{slug}",
-        "expires_at": to_iso_utc(expires_at),
+        "expires_at": expires_iso,
         "ttl_seconds": ttl,
     }
 
 
 @app.get("/api/pages/{slug}")
-def get_page(slug: str):
-    doc = db["page"].find_one({"slug": slug})
+async def get_page(slug: str, background_tasks: BackgroundTasks):
+    doc = await find_page(slug)
     if not doc:
         raise HTTPException(status_code=404, detail="Not found")
-    now = datetime.utcnow()
-    expires_at: datetime = doc["expires_at"]
-    # Normalize any tz-aware to naive UTC for comparison
-    if isinstance(expires_at, datetime) and expires_at.tzinfo is not None:
-        expires_at = expires_at.astimezone(timezone.utc).replace(tzinfo=None)
+    expires_epoch, expires_iso = page_expiry(doc)
+    remaining = expires_epoch - int(time.time())
 
-    if expires_at <= now:
-        # delete on access
-        db["page"].delete_one({"_id": doc["_id"]})
-        # try to remove assets
-        for asset in doc.get("assets", []) or []:
-            relative = asset.lstrip("/")
-            path = os.path.join(os.getcwd(), relative)
-            if not os.path.isfile(path):
-                path = os.path.join(UPLOAD_DIR, os.path.basename(relative))
-            try:
-                if os.path.isfile(path):
-                    os.remove(path)
-            except Exception:
-                pass
-        raise HTTPException(status_code=410, detail="Expired")
+    if remaining <= 0:
+        # delete on access, after the response is sent (raising would skip background tasks)
+        background_tasks.add_task(expire_page, doc)
+        return ORJSONResponse(status_code=410, content={"detail": "Expired"})
 
-    remaining = int((expires_at - now).total_seconds())
     return {
-        "slug": doc["slug"],
+        "slug": doc.get("slug", doc["_id"]),
         "html": doc["html"],
-        "expires_at": to_iso_utc(expires_at),
-        "remaining_seconds": max(0, remaining),
+        "expires_at": expires_iso,
+        "remaining_seconds": remaining,
         "assets": doc.get("assets", []),
     }
 
 
 @app.get("/p/{slug}", response_class=HTMLResponse)
-def view_page(slug: str):
-    doc = db["page"].find_one({"slug": slug})
+async def view_page(slug: str, background_tasks: BackgroundTasks):
+    now = int(time.time())
+    cached = get_cached_page(slug, now)
+    if cached is not None:
+        expires_epoch, body = cached
+        return HTMLResponse(content=render_page(body, expires_epoch - now))
+
+    doc = await find_page(slug)
     if not doc:
         raise HTTPException(status_code=404, detail="Not found")
-    now = datetime.utcnow()
-    expires_at: datetime = doc["expires_at"]
-    if isinstance(expires_at, datetime) and expires_at.tzinfo is not None:
-        expires_at = expires_at.astimezone(timezone.utc).replace(tzinfo=None)
+    expires_epoch, _ = page_expiry(doc)
 
-    if expires_at <= now:
-        # delete on access
-        db["page"].delete_one({"_id": doc["_id"]})
-        for asset in doc.get("assets", []) or []:
-            relative = asset.lstrip("/")
-            path = os.path.join(os.getcwd(), relative)
-            if not os.path.isfile(path):
-                path = os.path.join(UPLOAD_DIR, os.path.basename(relative))
-            try:
-                if os.path.isfile(path):
-                    os.remove(path)
-            except Exception:
-                pass
+    if expires_epoch <= now:
+        # delete on access, after the response is sent
+        background_tasks.add_task(expire_page, doc)
         return HTMLResponse(status_code=410, content="<html><body><div style='font-family:system-ui;padding:16px'>This temporary page has expired.</div></body></html>")
 
-    # Build timer widget without using str.format to avoid brace conflicts
-    remaining = int((expires_at - now).total_seconds())
-    timer_html = (
-        """
-    <div id=\"_meta\" style=\"position:fixed;right:8px;bottom:8px;z-index:9999;font:12px/1.2 system-ui,-apple-system,Segoe UI,Roboto,Helvetica,Arial,sans-serif;color:#444;background:rgba(255,255,255,0.7);backdrop-filter:saturate(1.2) blur(2px);padding:6px 8px;border-radius:6px\">
-      <span id=\"_time\"></span>s
-      <button id=\"_copy\" style=\"margin-left:8px;background:#000;color:#fff;border:none;padding:4px 6px;border-radius:4px;cursor:pointer;font-size:12px\">Copy link</button>
-    </div>
-    <script>
-      (function(){
-        var t = {remaining: __REM__};
-        var el = document.getElementById('_time');
-        el.textContent = t.remaining;
-        var iv = setInterval(function(){
-          if(!el) return;
-          if(t.remaining <= 0){ clearInterval(iv); location.reload(); return; }
-          t.remaining -= 1; el.textContent = t.remaining;
-        }, 1000);
-        document.getElementById('_copy').addEventListener('click', async function(){
-          try { await navigator.clipboard.writeText(window.location.href); this.textContent='Copied'; setTimeout(()=>this.textContent='Copy link',1200);} catch(e){}
-        });
-      })();
-    </script>
-    """
-    ).replace("__REM__", str(remaining))
-
-    content_html = doc["html"] or ""
-    html = f"""
-    <!doctype html>
-    <html>
-      <head>
-        <meta charset=\"utf-8\" />
-        <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
-        <title>Shared Content</title>
-        <style>html,body{{background:#fff;margin:0;padding:0}}img{{max-width:100%;height:auto}}</style>
-      </head>
-      <body>
-        {content_html}
-        {timer_html}
-      </body>
-    </html>
-    """
-    return HTMLResponse(content=html)
+    # Pages are immutable until expiry; only the timer value changes per request
+    body = _HTML_PREFIX + (doc["html"] or "").encode()
+    cache_page(slug, expires_epoch, body)
+    return HTMLResponse(content=render_page(body, expires_epoch - now))
+
+
+# Health checks poll /test often; the collection list is near-static, so reuse it briefly
+_collections_cache: Optional[Tuple[float, List[str]]] = None
+# Environment is read once at import, same as database.py
+_DATABASE_URL_SET = bool(os.getenv("DATABASE_URL"))
+_DATABASE_NAME_SET = bool(os.getenv("DATABASE_NAME"))
+
+
+async def list_collections_cached() -> List[str]:
+    global _collections_cache
+    now = time.monotonic()
+    if _collections_cache is not None and now - _collections_cache[0] < COLLECTIONS_CACHE_SECONDS:
+        return _collections_cache[1]
+    collections = await db.list_collection_names()
+    _collections_cache = (now, collections)
+    return collections
 
 
 @app.get("/test")
-def test_database():
+async def test_database():
     response = {
         "backend": "✅ Running",
         "database": "❌ Not Available",
@@ -302,7 +548,7 @@ def test_database():
             response["database_name"] = db.name if hasattr(db, 'name') else "✅ Connected"
             response["connection_status"] = "Connected"
             try:
-                collections = db.list_collection_names()
+                collections = await list_collections_cached()
                 response["collections"] = collections[:10]
                 response["database"] = "✅ Connected & Working"
             except Exception as e:
@@ -312,9 +558,8 @@ def test_database():
     except Exception as e:
         response["database"] = f"❌ Error: {str(e)[:50]}"
 
-    import os as _os
-    response["database_url"] = "✅ Set" if _os.getenv("DATABASE_URL") else "❌ Not Set"
-    response["database_name"] = "✅ Set" if _os.getenv("DATABASE_NAME") else "❌ Not Set"
+    response["database_url"] = "✅ Set" if _DATABASE_URL_SET else "❌ Not Set"
+    response["database_name"] = "✅ Set" if _DATABASE_NAME_SET else "❌ Not Set"
 
     return response
 
@@ -322,4 +567,15 @@ def test_database():
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # uvicorn picks up uvloop and httptools automatically when installed (see requirements.txt).
+    # Each worker refills its own expiry queue with a bounded window scan, so pages due in
+    # that window may be deleted once per worker; the repeats are no-ops.
+    # Worker processes need the app as an import string.
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        workers=int(os.getenv("WORKERS", os.cpu_count() or 1)),
+        backlog=int(os.getenv("BACKLOG", 4096)),
+        log_level=os.getenv("LOG_LEVEL", "warning"),
+    )
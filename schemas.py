@@ -45,7 +45,7 @@ class Page(BaseModel):
     Temporary pages users can share.
     Collection name: "page"
     """
-    slug: str = Field(..., description="Unique short id for the page")
+    slug: str = Field(..., description="Unique short id for the page (also stored as the document _id)")
     html: str = Field(..., description="Raw HTML content to render as-is")
     created_at: datetime = Field(..., description="Creation timestamp (UTC)")
     expires_at: datetime = Field(..., description="Expiry timestamp (UTC)")
@@ -0,0 +1,29 @@
+// Expiry countdown + copy-link widget for /p/{slug} pages.
+// The including <script> tag carries the seconds left in data-remaining.
+(function(){
+  var script = document.currentScript;
+  var remaining = parseInt(script && script.getAttribute('data-remaining'), 10) || 0;
+
+  var meta = document.createElement('div');
+  meta.id = '_meta';
+  meta.style.cssText = 'position:fixed;right:8px;bottom:8px;z-index:9999;font:12px/1.2 system-ui,-apple-system,Segoe UI,Roboto,Helvetica,Arial,sans-serif;color:#444;background:rgba(255,255,255,0.7);backdrop-filter:saturate(1.2) blur(2px);padding:6px 8px;border-radius:6px';
+  var el = document.createElement('span');
+  el.id = '_time';
+  var copy = document.createElement('button');
+  copy.id = '_copy';
+  copy.style.cssText = 'margin-left:8px;background:#000;color:#fff;border:none;padding:4px 6px;border-radius:4px;cursor:pointer;font-size:12px';
+  copy.textContent = 'Copy link';
+  meta.appendChild(el);
+  meta.appendChild(document.createTextNode('s'));
+  meta.appendChild(copy);
+  document.body.appendChild(meta);
+
+  el.textContent = remaining;
+  var iv = setInterval(function(){
+    if(remaining <= 0){ clearInterval(iv); location.reload(); return; }
+    remaining -= 1; el.textContent = remaining;
+  }, 1000);
+  copy.addEventListener('click', async function(){
+    try { await navigator.clipboard.writeText(window.location.href); this.textContent='Copied'; setTimeout(()=>this.textContent='Copy link',1200);} catch(e){}
+  });
+})();